@@ -1,12 +1,15 @@
-# config.py
-import toml
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
 from pathlib import Path
 
 class _Config:
     def __init__(self):
         cfg_path = Path(__file__).parent / "config.toml"
         if cfg_path.exists():
-            data = toml.load(cfg_path)
+            with cfg_path.open("rb") as f:
+                data = tomllib.load(f)
         else:
             data = {}
         self.gemini_api_key = data.get("gemini_api_key", "PUT_YOUR_KEY_HERE")
@@ -3,8 +3,10 @@
 # Requirements: google-genai, tkinter; reuses your config.toml key.
 # No external date libs; pure stdlib scheduling.
 
-import csv, json, re, time, uuid
-from datetime import datetime, timedelta
+import csv, functools, hashlib, json, math, os, queue, random, re, tempfile, threading, time, uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from tkinter import Tk, Text, StringVar, END, filedialog, messagebox, ttk
 
@@ -12,6 +14,15 @@ from google import genai
 from google.genai.errors import ServerError, ClientError
 from config import config
 
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+try:
+    from docx import Document as DocxDocument
+except ImportError:
+    DocxDocument = None
+
 # -------------------------
 # Config & client
 # -------------------------
@@ -19,78 +30,183 @@ MODEL = getattr(config, "gemini_model", "models/gemini-1.5-flash")
 client = genai.Client(api_key=config.gemini_api_key)
 
 OUTDIR = Path("data/outputs"); OUTDIR.mkdir(parents=True, exist_ok=True)
+MAX_BRIEF = 8000  # chars of the brief sent to the model
+
+# Exact-match response cache: regenerating with unchanged inputs is a file read
+CACHE_DIR = OUTDIR / ".cache"; CACHE_DIR.mkdir(parents=True, exist_ok=True)
+CACHE_MAX = 64
+_CACHE_LOCK = threading.Lock()  # serializes eviction scans across ai_batch threads
 
 # -------------------------
 # Helpers
 # -------------------------
-def slugify(s: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "-", s.strip().lower()).strip("-") or "project"
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+_JSON_DEC = json.JSONDecoder()
 
-def ai(prompt: str, retries=5, base=1.2) -> str:
+@functools.lru_cache(maxsize=256)
+def slugify(s: str) -> str:
+    return _SLUG_RE.sub("-", s.strip().lower()).strip("-") or "project"
+
+def cache_path(prompt: str) -> Path:
+    key = hashlib.sha256((MODEL + "\0" + prompt).encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{key}.txt"
+
+def _cache_put(p: Path, text: str):
+    # Write aside then rename, so a reader never sees a half-written entry
+    f = tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=CACHE_DIR, suffix=".tmp", delete=False)
+    try:
+        with f: f.write(text)
+        os.replace(f.name, p)
+    except OSError:
+        Path(f.name).unlink(missing_ok=True)
+        return  # the cache is best-effort; the response itself is fine
+    with _CACHE_LOCK:
+        entries = []
+        for q in CACHE_DIR.glob("*.txt"):
+            try: entries.append((q.stat().st_mtime, q))
+            except FileNotFoundError: pass  # removed since the glob
+        entries.sort()
+        for _, old in entries[:max(len(entries) - CACHE_MAX, 0)]:
+            old.unlink(missing_ok=True)
+
+def ai(prompt: str, retries=5, base=1.2, max_sleep=30.0, on_retry=None) -> str:
+    """Ask Gemini, retrying transient failures (5xx, 429) with capped, jittered backoff.
+    on_retry(attempt, retries, error) is called before each backoff sleep."""
+    p = cache_path(prompt)
+    try:
+        text = p.read_text(encoding="utf-8")
+    except OSError:
+        text = None  # miss (or unreadable/evicted): ask the model
+    if text is not None:
+        try: os.utime(p)  # mark as recently used for eviction
+        except OSError: pass
+        return text
     last=None
     for i in range(retries):
         try:
             r = client.models.generate_content(model=MODEL, contents=prompt)
-            return (r.text or "").strip()
+            text = (r.text or "").strip()
+            if text: _cache_put(p, text)
+            return text
         except (ServerError, ClientError) as e:
+            # 4xx other than rate limiting won't succeed on retry; fail fast
+            if isinstance(e, ClientError) and getattr(e, "code", None) != 429:
+                raise RuntimeError(f"Gemini rejected the request: {e}") from e
             last=e
-            time.sleep(base*(2**i))
+            if i == retries - 1: break
+            if on_retry: on_retry(i + 1, retries, e)
+            time.sleep(min(max_sleep, base*(2**i)) * (0.5 + random.random()))
     raise RuntimeError(f"Gemini failed after retries: {last}")
 
+def ai_batch(prompts, workers=8) -> list:
+    """Run independent prompts concurrently; results come back in prompt order."""
+    prompts = list(prompts)
+    if not prompts: return []
+    with ThreadPoolExecutor(min(workers, len(prompts))) as ex:
+        return list(ex.map(ai, prompts))
+
+def head_text(chunks, limit: int = MAX_BRIEF) -> str:
+    """Join text chunks with newlines, consuming only enough of them to fill `limit` chars."""
+    buf=[]; total=0
+    for c in chunks:
+        buf.append(c); total += len(c) + 1
+        if total >= limit: break
+    return "\n".join(buf)[:limit]
+
+def read_text_head(p, limit: int = MAX_BRIEF) -> str:
+    with open(p, encoding="utf-8", errors="ignore") as f:
+        return f.read(limit)
+
 def today_local() -> datetime:
     # you’re in America/New_York per your setup; stdlib naive dates are fine for simple ICS
     return datetime.now()
 
 def parse_due(date_str: str) -> datetime:
-    return datetime.strptime(date_str.strip(), "%Y-%m-%d")
+    s = date_str.strip()
+    # C fast path for canonical YYYY-MM-DD; anything else (e.g. 2025-1-5) keeps
+    # the strptime rules, so 3.11's extra ISO forms (20250105, 2025-W02-1) stay rejected
+    if len(s) == 10 and s[4] == s[7] == "-":
+        try:
+            d = date.fromisoformat(s)
+            return datetime(d.year, d.month, d.day)
+        except ValueError:
+            pass
+    return datetime.strptime(s, "%Y-%m-%d")
+
+# _WEEKDAYS_IN[wd][rem]: weekdays among `rem` consecutive days starting on weekday `wd`
+_WEEKDAYS_IN = [[sum((wd+i) % 7 < 5 for i in range(rem)) for rem in range(8)] for wd in range(7)]
 
 def workdays_between(start: datetime, end: datetime) -> int:
-    d=0; cur=start
-    while cur.date() <= end.date():
-        if cur.weekday() < 5: d += 1
-        cur += timedelta(days=1)
-    return max(d, 1)
+    days = end.toordinal() - start.toordinal() + 1
+    if days <= 0: return 1
+    full_weeks, rem = divmod(days, 7)
+    return max(full_weeks*5 + _WEEKDAYS_IN[start.weekday()][rem], 1)
 
 def distribute_hours(total_hours: float, start: datetime, end: datetime, hours_per_week: float):
-    """Yield (date, hours_that_day) across weekdays, capped by hours_per_week/5 per day."""
+    """Return [(date, hours_that_day)] across weekdays, capped by hours_per_week/5 per day."""
     per_day = max(hours_per_week/5.0, 0.5)  # at least 0.5h/day to ensure progress
-    remaining = float(total_hours)
-    cur = start
-    while remaining > 1e-6 and cur.date() <= end.date():
-        if cur.weekday() < 5:
-            h = min(per_day, remaining)
-            yield cur.date(), h
-            remaining -= h
-        cur += timedelta(days=1)
-
-def write_ics(events, path: Path, cal_name="Planner.AI"):
-    # Minimal RFC5545 .ics
-    def dtstamp(dt: datetime): return dt.strftime("%Y%m%dT%H%M%S")
-    now = datetime.utcnow()
-    lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        f"PRODID:-//Planner.AI//EN",
-        f"X-WR-CALNAME:{cal_name}",
-    ]
-    for ev in events:
-        uid = ev.get("uid", str(uuid.uuid4()))
-        start_dt = ev["start"]
-        end_dt = ev["end"]
-        summary = ev.get("summary","Task")
-        desc = ev.get("description","")
-        lines += [
-            "BEGIN:VEVENT",
-            f"UID:{uid}",
-            f"DTSTAMP:{dtstamp(now)}Z",
-            f"DTSTART:{dtstamp(start_dt)}",
-            f"DTEND:{dtstamp(end_dt)}",
-            f"SUMMARY:{summary}",
-            f"DESCRIPTION:{desc.replace('\n',' ')}",
-            "END:VEVENT"
-        ]
-    lines.append("END:VCALENDAR")
-    path.write_text("\n".join(lines), encoding="utf-8")
+    total_hours = float(total_hours)
+    if not total_hours > 1e-6: return []  # also rejects NaN
+    # Never plan past the weekdays left before `end` (this also bounds inf hours)
+    avail = workdays_between(start, end)
+    if total_hours >= avail*per_day:
+        n_full, rem = avail, 0.0
+    else:
+        n_full = int(total_hours // per_day)
+        rem = total_hours - n_full*per_day
+    n_days = n_full + (1 if rem > 1e-6 else 0)
+    # Jump to the first weekday, then the k-th weekday after it is pure ordinal math
+    s = start.toordinal(); wd = start.weekday()
+    if wd >= 5: s += 7 - wd; wd = 0
+    last = end.toordinal()
+    blocks = []
+    for k in range(n_days):
+        p = wd + k
+        o = s + (p//5)*7 + p%5 - wd
+        if o > last: break
+        blocks.append((date.fromordinal(o), per_day if k < n_full else rem))
+    return blocks
+
+# RFC5545 TEXT escaping in one pass
+_ICS_TRANS = str.maketrans({"\\": r"\\", ";": r"\;", ",": r"\,", "\n": r"\n", "\r": ""})
+
+def write_ics(events, path: Path, cal_name="Planner.AI", dtstamp: datetime = None):
+    # Minimal RFC5545 .ics, streamed straight to disk; dtstamp is UTC
+    def fmt(dt: datetime): return dt.strftime("%Y%m%dT%H%M%S")
+    now = fmt(dtstamp or datetime.utcnow())
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = f.write
+        w("BEGIN:VCALENDAR\n")
+        w("VERSION:2.0\n")
+        w("PRODID:-//Planner.AI//EN\n")
+        w(f"X-WR-CALNAME:{cal_name.translate(_ICS_TRANS)}\n")
+        for ev in events:
+            w("BEGIN:VEVENT\n")
+            w(f"UID:{ev.get('uid') or uuid.uuid4()}\n")
+            w(f"DTSTAMP:{now}Z\n")
+            w(f"DTSTART:{fmt(ev['start'])}\n")
+            w(f"DTEND:{fmt(ev['end'])}\n")
+            w(f"SUMMARY:{ev.get('summary','Task').translate(_ICS_TRANS)}\n")
+            w(f"DESCRIPTION:{ev.get('description','').translate(_ICS_TRANS)}\n")
+            w("END:VEVENT\n")
+        w("END:VCALENDAR\n")
+
+CSV_FAST = True  # set False to always go through the csv module
+
+def write_csv(rows, path: Path):
+    header = ["Task","Est. Hours","Start","End","Notes"]
+    # rows are [name, hours, start, end, notes]; only name/notes are free text
+    if CSV_FAST and not any("\n" in r[0] or "\r" in r[0] or "\n" in r[4] or "\r" in r[4] for r in rows):
+        lines = [",".join(header)]
+        for r in rows:
+            name = r[0].replace('"','""'); notes = r[4].replace('"','""')
+            lines.append(f'"{name}",{r[1]},{r[2]},{r[3]},"{notes}"')
+        path.write_text("\r\n".join(lines) + "\r\n", encoding="utf-8", newline="")
+        return
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows)
 
 def parse_tasks_json(s: str):
     """
@@ -102,13 +218,16 @@ def parse_tasks_json(s: str):
       ],
       "assumptions":"..."
     }
+    Returns (tasks, assumptions, total_hours).
     """
     # Try to extract JSON block even if model wrapped it in code fences.
-    m = re.search(r"\{.*\}", s, flags=re.S)
-    if not m:
+    # raw_decode stops at the end of the object, so trailing prose is ignored.
+    i = s.find("{")
+    if i < 0:
         raise ValueError("No JSON found from model.")
-    data = json.loads(m.group(0))
+    data, _ = _JSON_DEC.raw_decode(s, i)
     tasks = data.get("tasks", [])
+    total_hours = 0.0
     for t in tasks:
         # normalize
         t["name"] = str(t.get("name","")).strip()[:120]
@@ -117,34 +236,34 @@ def parse_tasks_json(s: str):
             t["hours"] = float(t.get("hours", 1.0))
         except:
             t["hours"] = 1.0
+        total_hours += t["hours"]
         t["depends_on"] = [str(x) for x in t.get("depends_on", [])]
-    return tasks, data.get("assumptions","")
+    return tasks, data.get("assumptions",""), total_hours
 
 def topological_sort(tasks):
+    # Kahn's algorithm: build dep -> dependents once, then O(V+E)
     name_to_task = {t["name"]: t for t in tasks}
-    indeg = {t["name"]: 0 for t in tasks}
+    indeg = {n: 0 for n in name_to_task}
+    dependents = {n: [] for n in name_to_task}
     for t in tasks:
         for dep in t["depends_on"]:
-            if dep in indeg:
+            if dep in dependents:
+                dependents[dep].append(t["name"])
                 indeg[t["name"]] += 1
-    q = [n for n,d in indeg.items() if d==0]
+    q = deque(n for n,d in indeg.items() if d==0)
     order=[]
     while q:
-        n = q.pop(0)
+        n = q.popleft()
         order.append(name_to_task[n])
-        for t in tasks:
-            if n in t["depends_on"]:
-                indeg[t["name"]] -= 1
-                if indeg[t["name"]] == 0:
-                    q.append(t["name"])
+        for m in dependents[n]:
+            indeg[m] -= 1
+            if indeg[m] == 0:
+                q.append(m)
     # If cycle, just return original order
     return order if len(order)==len(tasks) else tasks
 
 def schedule_tasks(tasks, start: datetime, due: datetime, hours_per_week: float):
     """Greedy forward schedule by topo-order across weekdays."""
-    # Make a simple per-task window evenly across the total span
-    span_days = max(workdays_between(start, due), 1)
-    total_hours = sum(t["hours"] for t in tasks) or 1.0
     events=[]
     csv_rows=[]
     cur_start = start
@@ -154,17 +273,20 @@ def schedule_tasks(tasks, start: datetime, due: datetime, hours_per_week: float)
 
     for t in topological_sort(tasks):
         # Earliest start: max(current pointer, all deps' end)
-        dep_end = max([finished_dates.get(dep, start) for dep in t["depends_on"]] or [start])
+        dep_end = start
+        for dep in t["depends_on"]:
+            fd = finished_dates.get(dep)
+            if fd is not None and fd > dep_end: dep_end = fd
         task_start = max(cur_start, dep_end)
         # Allocate hours day-by-day
-        blocks = list(distribute_hours(t["hours"], task_start, due, hours_per_week))
+        blocks = distribute_hours(t["hours"], task_start, due, hours_per_week)
         if not blocks:
             # if we ran out of days, push same-day small block on due date
             blocks = [(due.date(), t["hours"])]
         first_day = None; last_day=None
         for d, h in blocks:
             # 10:00–(10:00+h) simple block
-            st = datetime.combine(d, datetime.min.time()) + timedelta(hours=10)
+            st = datetime(d.year, d.month, d.day, 10)
             et = st + timedelta(hours=h)
             events.append({
                 "start": st,
@@ -174,13 +296,13 @@ def schedule_tasks(tasks, start: datetime, due: datetime, hours_per_week: float)
             })
             if first_day is None: first_day = d
             last_day = d
-        finished_dates[t["name"]] = datetime.combine(last_day, datetime.min.time()) + timedelta(hours=18)
+        finished_dates[t["name"]] = datetime(last_day.year, last_day.month, last_day.day, 18)
         cur_start = finished_dates[t["name"]]
         csv_rows.append([t["name"], f"{t['hours']:.1f}", str(first_day), str(last_day), t["why"]])
     return events, csv_rows
 
-def make_prompt(title, due_date, hours_per_week, brief_text):
-    return f"""
+# Static part of the prompt, built once; only the inputs below it change per call
+_PROMPT_HEAD = """
 You are a project planning assistant for a student project.
 
 GOAL: Break the project into 5–10 concrete tasks (each 1–6 hours) that a busy student can do on weekdays.
@@ -190,22 +312,24 @@ CONSTRAINTS:
 - Prefer small, actionable tasks (e.g., "Collect 3 sources", "Draft intro", "Build first prototype button", "User test with 2 people").
 - Output STRICT JSON only (no commentary, no markdown). Use this schema:
 
-{{
+{
   "tasks":[
-    {{"name":"short action task", "why":"why this matters", "hours": 2.0, "depends_on": []}},
+    {"name":"short action task", "why":"why this matters", "hours": 2.0, "depends_on": []},
     ...
   ],
   "assumptions":"short bullet list or sentences about your assumptions"
-}}
+}
 
 INPUTS:
-- Project title: "{title}"
-- Due date: {due_date} (YYYY-MM-DD)
-- Available hours per week: {hours_per_week}
-- Brief or guidelines:
-\"\"\"{brief_text[:8000]}\"\"\"
 """
 
+def make_prompt(title, due_date, hours_per_week, brief_text):
+    return (f'{_PROMPT_HEAD}- Project title: "{title}"\n'
+            f'- Due date: {due_date} (YYYY-MM-DD)\n'
+            f'- Available hours per week: {hours_per_week}\n'
+            '- Brief or guidelines:\n'
+            f'"""{brief_text}"""\n')
+
 # -------------------------
 # Tiny Tkinter UI
 # -------------------------
@@ -214,7 +338,7 @@ class App:
         self.root = root
         root.title("Planner.AI — Minimal")
         self.title_var = StringVar(value="Untitled Project")
-        self.due_var = StringVar(value=(today_local()+timedelta(days=14)).strftime("%Y-%m-%d"))
+        self.due_var = StringVar(value=(today_local()+timedelta(days=14)).date().isoformat())
         self.hpw_var = StringVar(value="8")
         self.brief = Text(root, height=12, wrap="word")
 
@@ -236,29 +360,32 @@ class App:
 
         btns = ttk.Frame(frm); btns.grid(row=4, column=0, columnspan=4, sticky="ew", pady=(8,0))
         for i in range(2): btns.columnconfigure(i, weight=1)
-        ttk.Button(btns, text="Generate Plan", command=self.generate).grid(row=0, column=0, sticky="ew", padx=(0,6))
+        self.gen_btn = ttk.Button(btns, text="Generate Plan", command=self.generate)
+        self.gen_btn.grid(row=0, column=0, sticky="ew", padx=(0,6))
         ttk.Button(btns, text="Clear", command=lambda: self.brief.delete("1.0", END)).grid(row=0, column=1, sticky="ew")
 
         self.status = StringVar(value="Ready.")
         ttk.Label(frm, textvariable=self.status).grid(row=5, column=0, columnspan=4, sticky="w", pady=(8,0))
 
+        # Worker thread -> Tk thread messages: ("status", msg) / ("done", paths) / ("error", exc)
+        self.q = queue.Queue()
+
     def load_file(self):
         p = filedialog.askopenfilename(title="Select a brief or guidelines file",
                                        filetypes=[("Text-like","*.txt *.md *.pdf *.docx"), ("All","*.*")])
         if not p: return
         text = ""
         try:
-            from pypdf import PdfReader
-            from docx import Document as DocxDocument
+            # Stop pulling pages/paragraphs once there's enough for the prompt
             ext = Path(p).suffix.lower()
-            if ext == ".pdf":
-                rd = PdfReader(p); text = "\n".join(pg.extract_text() or "" for pg in rd.pages)
-            elif ext == ".docx":
-                doc = DocxDocument(p); text = "\n".join(par.text for par in doc.paragraphs)
+            if ext == ".pdf" and PdfReader is not None:
+                rd = PdfReader(p); text = head_text(pg.extract_text() or "" for pg in rd.pages)
+            elif ext == ".docx" and DocxDocument is not None:
+                doc = DocxDocument(p); text = head_text(par.text for par in doc.paragraphs)
             else:
-                text = Path(p).read_text(encoding="utf-8", errors="ignore")
+                text = read_text_head(p)
         except Exception:
-            try: text = Path(p).read_text(encoding="utf-8", errors="ignore")
+            try: text = read_text_head(p)
             except Exception: text = ""
         if not text.strip():
             messagebox.showerror("Planner.AI","Could not read file.")
@@ -269,51 +396,66 @@ class App:
         try:
             title = self.title_var.get().strip() or "Untitled Project"
             due = parse_due(self.due_var.get())
-            start = today_local()
-            if due.date() < start.date():
+            # one clock read per plan, so a job straddling midnight stays consistent
+            now = today_local()
+            if due.date() < now.date():
                 messagebox.showerror("Planner.AI","Due date is in the past.")
                 return
             try:
                 # how = hours oer week 
                 hpw = float(self.hpw_var.get())
+                if not math.isfinite(hpw): raise ValueError(hpw)  # "inf"/"nan" parse but can't be scheduled
             except:
                 hpw = 8.0
-            brief_text = self.brief.get("1.0", END).strip()
+            # only copy what the prompt will use out of the Text widget
+            brief_text = self.brief.get("1.0", f"1.0 + {MAX_BRIEF} chars").strip()
             if not brief_text:
                 messagebox.showinfo("Planner.AI","Paste or load a brief first.")
                 return
-            
-            self.status.set("Asking Gemini for task breakdown…")
-            self.root.update_idletasks()
-            
+        except Exception as e:
+            messagebox.showerror("Planner.AI", f"Error: {e}")
+            self.status.set("Error.")
+            return
+
+        # Gemini can take a while; keep the UI responsive and block re-entry
+        self.gen_btn.state(["disabled"])
+        threading.Thread(target=self._worker, args=(title, now, due, hpw, brief_text), daemon=True).start()
+        self.root.after(100, self._drain_queue)
+
+    def _worker(self, title, now, due, hpw, brief_text):
+        """Runs off the Tk thread: never touch widgets here, only post to self.q."""
+        try:
+            self.q.put(("status", "Asking Gemini for task breakdown…"))
+
             # fetcing the due date time imputted
-            raw = ai(make_prompt(title, due.strftime("%Y-%m-%d"), hpw, brief_text))
+            prompt = make_prompt(title, due.date().isoformat(), hpw, brief_text)
+            raw = ai(prompt, on_retry=lambda i, n, e: self.q.put(("status", f"Gemini busy, retrying ({i}/{n})…")))
 
-            tasks, assumptions = parse_tasks_json(raw)
-            if not tasks:
-                raise RuntimeError("No tasks returned by model.")
+            try:
+                tasks, assumptions, total_h = parse_tasks_json(raw)
+                if not tasks:
+                    raise RuntimeError("No tasks returned by model.")
+            except Exception:
+                # don't keep serving an unusable response from the cache
+                cache_path(prompt).unlink(missing_ok=True)
+                raise
 
-            self.status.set("Scheduling tasks to due date…")
-            self.root.update_idletasks()
-            events, rows = schedule_tasks(tasks, start, due, hpw)
+            self.q.put(("status", "Scheduling tasks to due date…"))
+            events, rows = schedule_tasks(tasks, now, due, hpw)
 
             proj_dir = OUTDIR / slugify(title)
             proj_dir.mkdir(parents=True, exist_ok=True)
 
             # CSV
             csvp = proj_dir / "plan.csv"
-            with csvp.open("w", newline="", encoding="utf-8") as f:
-                w = csv.writer(f)
-                w.writerow(["Task","Est. Hours","Start","End","Notes"])
-                w.writerows(rows)
+            write_csv(rows, csvp)
 
             # ICS
             icsp = proj_dir / "plan.ics"
-            write_ics(events, icsp, cal_name=f"Planner.AI — {title}")
+            write_ics(events, icsp, cal_name=f"Planner.AI — {title}", dtstamp=now.astimezone(timezone.utc))
 
             # MD summary
             mdp = proj_dir / "plan.md"
-            total_h = sum(t["hours"] for t in tasks)
             md = [f"# Plan: {title}", f"- Due: {due.date()}", f"- Hours/week: {hpw}", f"- Estimated total hours: {total_h:.1f}", ""]
             md.append("## Tasks")
             for r in rows:
@@ -322,11 +464,30 @@ class App:
                 md += ["", "## Assumptions", assumptions]
             mdp.write_text("\n".join(md), encoding="utf-8")
 
-            self.status.set(f"Done. Saved:\n{csvp}\n{icsp}\n{mdp}")
-            messagebox.showinfo("Planner.AI", f"Saved:\n{csvp}\n{icsp}\n{mdp}")
+            self.q.put(("done", (csvp, icsp, mdp)))
         except Exception as e:
-            messagebox.showerror("Planner.AI", f"Error: {e}")
-            self.status.set("Error.")
+            self.q.put(("error", e))
+
+    def _drain_queue(self):
+        while True:
+            try:
+                kind, payload = self.q.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "status":
+                self.status.set(payload)
+            elif kind == "done":
+                saved = "\n".join(str(p) for p in payload)
+                self.status.set(f"Done. Saved:\n{saved}")
+                messagebox.showinfo("Planner.AI", f"Saved:\n{saved}")
+                self.gen_btn.state(["!disabled"])
+                return
+            elif kind == "error":
+                messagebox.showerror("Planner.AI", f"Error: {payload}")
+                self.status.set("Error.")
+                self.gen_btn.state(["!disabled"])
+                return
+        self.root.after(100, self._drain_queue)
 
 def main():
     if not config.gemini_api_key or str(config.gemini_api_key).startswith("PUT_"):